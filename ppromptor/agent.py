@@ -1,16 +1,19 @@
 import argparse
 from copy import copy, deepcopy
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import sqlalchemy
 from langchain.chains.llm import LLMChain
 from ppromptor.analyzers import Analyzer
 from ppromptor.base.command import CommandExecutor
 from ppromptor.base.schemas import EvalSet, IOPair, PromptCandidate
-from ppromptor.config import DEFAULT_PRIORITY
-from ppromptor.db import create_engine, get_session, reset_running_cmds
+from ppromptor.config import DEFAULT_MAX_CONCURRENCY, DEFAULT_PRIORITY
+from ppromptor.db import (add_candidate, create_engine,
+                          get_eval_set_for_dataset, get_session, is_analyzed,
+                          reset_running_cmds)
 from ppromptor.evaluators import Evaluator
 from ppromptor.job_queues import BaseJobQueue, ORMJobQueue, PriorityJobQueue
+from ppromptor.llms.cache import BaseLLMCache, ORMLLMCache
 from ppromptor.loggers import logger
 from ppromptor.proposers import Proposer
 from ppromptor.scorefuncs import SequenceMatcherScore
@@ -27,6 +30,12 @@ class BaseAgent:
             self.db_sess = db
         else:
             self.db_sess = None
+
+        if self.db_sess:
+            self.llm_cache: Optional[BaseLLMCache] = ORMLLMCache(self.db_sess)
+        else:
+            self.llm_cache = None
+
         self._agent_state = 0  # 0: stoped, 1: running 2: waiting for stopping
 
     @property
@@ -55,20 +64,19 @@ class SimpleAgent(BaseAgent):
 
             # 1. Propose Candidates
             if len(candidates) <= 0:
-                proposer = Proposer(self.analysis_llm)
+                proposer = Proposer(self.analysis_llm, cache=self.llm_cache)
                 candidate = proposer.propose(dataset)
             else:
                 candidate = candidates.pop()
 
             if self.db_sess:
-                self.db_sess.add(candidate)
-                self.db_sess.commit()
+                candidate = add_candidate(self.db_sess, candidate)
 
             evaluatee_prompt = candidate.prompt
             print("evaluatee_prompt", evaluatee_prompt)
 
             # 2. Evaluate Candidates and Generate EvalResults
-            evaluator = Evaluator(self.eval_llm)
+            evaluator = Evaluator(self.eval_llm, cache=self.llm_cache)
             evaluator.add_score_func(SequenceMatcherScore(llm=None))
 
             eval_set = evaluator.evaluate(dataset, candidate)
@@ -83,7 +91,7 @@ class SimpleAgent(BaseAgent):
 
             # 3. Analyze EvalResults and Generate Analysis and Recommendation
             reports = []
-            analyzer = Analyzer(llm=self.analysis_llm)
+            analyzer = Analyzer(llm=self.analysis_llm, cache=self.llm_cache)
 
             analysis = analyzer.analyze(candidate, [eval_set])
             reports.append(analysis)
@@ -117,15 +125,21 @@ class SimpleAgent(BaseAgent):
 
 
 class JobQueueAgent(BaseAgent):
-    def __init__(self, eval_llm, analysis_llm, db=None) -> None:
+    def __init__(self, eval_llm, analysis_llm, db=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 dedup_threshold=None) -> None:
         super().__init__(eval_llm, analysis_llm, db)
+        self.dedup_threshold = dedup_threshold
         self._queue: BaseJobQueue = ORMJobQueue(session=self.db_sess)
 
         self._cmds: Dict[str, CommandExecutor] = {
             "Evaluator": Evaluator(self.eval_llm,
-                                   [SequenceMatcherScore(llm=None)]),
-            "Analyzer": Analyzer(self.analysis_llm),
-            "Proposer": Proposer(self.analysis_llm)
+                                   [SequenceMatcherScore(llm=None)],
+                                   max_concurrency=max_concurrency,
+                                   cache=self.llm_cache,
+                                   session=self.db_sess),
+            "Analyzer": Analyzer(self.analysis_llm, cache=self.llm_cache),
+            "Proposer": Proposer(self.analysis_llm, cache=self.llm_cache)
         }
 
         self._cmd_output = {
@@ -147,7 +161,33 @@ class JobQueueAgent(BaseAgent):
         self._queue.put({
                 "cmd": cmd_s,
                 "data": data
-            }, priority)        
+            }, priority)
+
+    def _route_candidate(self, data: dict) -> Optional[str]:
+        """
+        Decide the next command for a newly proposed candidate. A
+        candidate already evaluated on the current dataset reuses its
+        EvalSet and skips the Evaluator.
+        """
+        if not self.db_sess:
+            return "Evaluator"
+
+        eval_set = get_eval_set_for_dataset(self.db_sess,
+                                            data["candidate"],
+                                            data["dataset"])
+        if eval_set is None:
+            return "Evaluator"
+
+        if is_analyzed(self.db_sess, eval_set):
+            # Analysis of the same EvalSet leads back to the same
+            # candidate, so this chain has converged.
+            logger.info(f"EvalSet(id={eval_set.id}) of duplicate candidate "
+                        "was analyzed before, stop this chain")
+            return None
+
+        logger.info(f"Reuse EvalSet(id={eval_set.id}) of duplicate candidate")
+        data["eval_sets"] = eval_set
+        return "Analyzer"
 
     def run(self, dataset, epochs=-1) -> None:
 
@@ -192,8 +232,12 @@ class JobQueueAgent(BaseAgent):
             logger.info(f"Result: {result}")
 
             if self.db_sess:
-                self.db_sess.add(result)
-                self.db_sess.commit()
+                if isinstance(result, PromptCandidate):
+                    result = add_candidate(self.db_sess, result,
+                                           self.dedup_threshold)
+                else:
+                    self.db_sess.add(result)
+                    self.db_sess.commit()
 
             data = copy(data)
             # Cannot use deepcopy here since the copied elements are not
@@ -203,9 +247,15 @@ class JobQueueAgent(BaseAgent):
 
             data[self._cmd_output[cmd_s]] = result
 
-            self.add_command(self._next_action[cmd_s],
-                             data,
-                             DEFAULT_PRIORITY)
+            if cmd_s == "Proposer":
+                next_cmd = self._route_candidate(data)
+            else:
+                next_cmd = self._next_action[cmd_s]
+
+            if next_cmd:
+                self.add_command(next_cmd,
+                                 data,
+                                 DEFAULT_PRIORITY)
             self._queue.done(task, 2)
 
             acc_epochs += 1
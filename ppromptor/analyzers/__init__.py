@@ -2,7 +2,7 @@
 import re
 import textwrap
 from abc import abstractmethod
-from typing import List, Union
+from typing import List, Optional, Union
 
 from langchain.chains.llm import LLMChain
 from langchain.llms.base import BaseLLM
@@ -11,16 +11,19 @@ from ppromptor.base.command import CommandExecutor
 from ppromptor.base.schemas import (Analysis, EvalResult, EvalSet,
                                     PromptCandidate, Recommendation)
 from ppromptor.config import PP_VERBOSE
+from ppromptor.llms.cache import BaseLLMCache
 from ppromptor.loggers import logger
 from ppromptor.scorefuncs import score_func_selector
 from ppromptor.utils import bulletpointize, get_llm_params
 
 
 class BaseAnalyzer(CommandExecutor):
-    def __init__(self, llm: BaseLLM) -> None:
+    def __init__(self, llm: BaseLLM,
+                 cache: Optional[BaseLLMCache] = None) -> None:
         self._prompt: Union[PromptTemplate, None] = None
         self.template: PromptCandidate
         self.llm = llm
+        self.cache = cache
         self._prompt_str: str
         self._validate_prompt()
 
@@ -56,7 +59,7 @@ class BaseAnalyzer(CommandExecutor):
 
 
 class Analyzer(BaseAnalyzer):
-    def __init__(self, llm):
+    def __init__(self, llm, cache: Optional[BaseLLMCache] = None):
         self._prompt_str = """
         I create an LLM AI robot that work as a {role} to {goal}. This AI robot
         is equipped with a LLM to generate output and is expected to follow 
@@ -108,7 +111,7 @@ class Analyzer(BaseAnalyzer):
 
         Ok, now, lets think step by step.
         """
-        super().__init__(llm)
+        super().__init__(llm, cache)
 
     def _select_results(self, eval_sets: List[EvalSet]):
         return eval_sets
@@ -142,9 +145,9 @@ class Analyzer(BaseAnalyzer):
             "score_funcs": bulletpointize(score_funcc_desc)
         }
 
-        res = chain(value)
+        res = self._run_chain(chain, value)
 
-        recommendation = self.parse_output(res["text"])
+        recommendation = self.parse_output(res)
 
         return Analysis(self.__class__.__name__,
                         results, recommendation)
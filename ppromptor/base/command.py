@@ -1,7 +1,32 @@
 from abc import abstractmethod
+from typing import Any, Dict, Optional
+
+from ppromptor.llms.cache import BaseLLMCache, llm_cache_key
+from ppromptor.utils import get_llm_params
 
 
 class CommandExecutor:
+    cache: Optional[BaseLLMCache] = None
+
     @abstractmethod
     def run_cmd(self, **kwargs):
         pass
+
+    def _run_chain(self, chain, inputs: Dict[str, Any]) -> str:
+        """
+        Run an LLMChain and return its text output, served from
+        self.cache when the same prompt was sent to the same LLM before
+        """
+        if self.cache is None:
+            return chain(inputs)["text"]
+
+        prompt = chain.prompt.format(
+            **{k: inputs[k] for k in chain.prompt.input_variables})
+        llm_params = get_llm_params(chain.llm)
+        key = llm_cache_key(prompt, llm_params)
+
+        text = self.cache.lookup(key)
+        if text is None:
+            text = chain(inputs)["text"]
+            self.cache.update(key, prompt, llm_params, text)
+        return text
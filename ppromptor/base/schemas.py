@@ -4,8 +4,8 @@ from typing import Any, Dict, List, Optional, Union
 
 from dataclasses_json import dataclass_json
 from langchain.prompts import PromptTemplate
-from ppromptor.utils import bulletpointize
-from sqlalchemy import JSON, Column, ForeignKey, Table
+from ppromptor.utils import bulletpointize, hash_content
+from sqlalchemy import JSON, Column, ForeignKey, Table, event
 from sqlalchemy.orm import (DeclarativeBase, Mapped, MappedAsDataclass,
                             mapped_column, relationship)
 
@@ -27,6 +27,40 @@ class PromptCandidate(Base):
     examples: Mapped[List[str]] = Column(JSON)
     output_format: Mapped[str] = mapped_column(default="")
 
+    fingerprint: Mapped[Optional[str]] = mapped_column(init=False,
+                                                       default=None,
+                                                       unique=True,
+                                                       index=True)
+    """compute_fingerprint() of the candidate, set when it is flushed"""
+
+    def canonical_text(self) -> str:
+        """
+        Normalized representation of the candidate: whitespace is
+        collapsed, and guidelines/constraints are order-insensitive
+        """
+        def _norm(value):
+            return " ".join(str(value).split())
+
+        def _norm_list(values):
+            if values is None:
+                return []
+            if isinstance(values, str):
+                values = [values]
+            return sorted(filter(None, [_norm(x) for x in values]))
+
+        parts = [
+            f"ROLE: {_norm(self.role)}",
+            f"GOAL: {_norm(self.goal)}",
+            "GUIDELINES: " + "\n".join(_norm_list(self.guidelines)),
+            "CONSTRAINTS: " + "\n".join(_norm_list(self.constraints)),
+            "EXAMPLES: " + "\n".join(_norm_list(self.examples)),
+            f"OUTPUT_FORMAT: {_norm(self.output_format or '')}"
+        ]
+        return "\n".join(parts)
+
+    def compute_fingerprint(self) -> str:
+        return hash_content(self.canonical_text())
+
     @property
     def prompt(self):
         guidelines = bulletpointize(self.guidelines)
@@ -62,10 +96,20 @@ class IOPair(Base):
     input: Mapped[str] = mapped_column()
     output: Mapped[str] = mapped_column()
 
+    @property
+    def content_hash(self) -> str:
+        return hash_content(self.input, self.output)
+
     def __str__(self):
         return f"Input: {self.input}; Output: {self.output}"
 
 
+@event.listens_for(PromptCandidate, "before_insert")
+@event.listens_for(PromptCandidate, "before_update")
+def _set_candidate_fingerprint(mapper, connection, target):
+    target.fingerprint = target.compute_fingerprint()
+
+
 association_result_set = Table(
     "association_result_set",
     Base.metadata,
@@ -94,6 +138,12 @@ class EvalResult(Base):
     data_id: Mapped[int] = mapped_column(
         ForeignKey("io_pair.id"), default=None)
 
+    candidate_fp: Mapped[Optional[str]] = mapped_column(default=None,
+                                                        index=True)
+    """PromptCandidate.compute_fingerprint() of the evaluated candidate"""
+    data_hash: Mapped[Optional[str]] = mapped_column(default=None)
+    """IOPair.content_hash of the record at evaluation time"""
+
     def __str__(self):
         return (f"Input: [{self.data.input}],"
                 f" Prediction: [{self.prediction}],"
@@ -195,6 +245,24 @@ class Command(Base):
         return None
 
 
+@dataclass_json
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+
+    key: Mapped[str] = mapped_column(unique=True, index=True)
+    """sha256 of the rendered prompt and llm_params"""
+
+    prompt: Mapped[str] = mapped_column()
+    response: Mapped[str] = mapped_column()
+    llm_params: Mapped[Dict[str, Any]] = Column(JSON)
+
+    created_at: Mapped[float] = mapped_column(default=0.0)
+    accessed_at: Mapped[float] = mapped_column(default=0.0, index=True)
+    hits: Mapped[int] = mapped_column(default=0)
+
+
 TABLE_MAP = {
     "PromptCandidate": PromptCandidate,
     "IOPair": IOPair,
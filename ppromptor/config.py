@@ -1,2 +1,5 @@
 PP_VERBOSE = False
 DEFAULT_PRIORITY = 0
+DEFAULT_MAX_CONCURRENCY = 1
+LLM_CACHE_MAX_SIZE = 100000
+LLM_CACHE_MAX_AGE = None  # in seconds, None to keep entries forever
@@ -1,8 +1,10 @@
 from ppromptor.base.schemas import (Analysis, Command, EvalResult, EvalSet,
-                                    IOPair, PromptCandidate, Recommendation,
-                                    association_result_set,
+                                    IOPair, LLMCacheEntry, PromptCandidate,
+                                    Recommendation, association_result_set,
                                     association_resultset_analysis)
+from ppromptor.loggers import logger
 from sqlalchemy import create_engine as slc_create_engine
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
 
 CMD_STATE_CODE = {
@@ -22,12 +24,64 @@ def create_engine(db_path, echo=False):
     PromptCandidate.__table__.create(engine, checkfirst=True)
     Recommendation.__table__.create(engine, checkfirst=True)
     Command.__table__.create(engine, checkfirst=True)
+    LLMCacheEntry.__table__.create(engine, checkfirst=True)
     association_result_set.create(engine, checkfirst=True)
     association_resultset_analysis.create(engine, checkfirst=True)
 
+    for table in (EvalResult.__table__, PromptCandidate.__table__):
+        _upgrade_table(engine, table)
+
+    _backfill_fingerprints(engine)
+
     return engine
 
 
+def _upgrade_table(engine, table):
+    """
+    Add columns and indexes introduced after the table was created.
+    New columns are expected to be nullable.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            col_type = column.type.compile(engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} "
+                              f"ADD COLUMN {column.name} {col_type}"))
+            logger.info(f"Column {table.name}.{column.name} added")
+
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
+
+
+def _backfill_fingerprints(engine):
+    """
+    Set fingerprints of candidates created before fingerprinting existed.
+    Duplicates of an already fingerprinted candidate are left as NULL
+    to satisfy the unique index.
+    """
+    sess = Session(engine)
+    candidates = sess.query(PromptCandidate).filter(
+        PromptCandidate.fingerprint.is_(None)).all()
+
+    if candidates:
+        used = set(x for (x, ) in sess.query(PromptCandidate.fingerprint)
+                   .filter(PromptCandidate.fingerprint.isnot(None)))
+
+        for candidate in candidates:
+            fp = candidate.compute_fingerprint()
+            if fp not in used:
+                used.add(fp)
+                sess.execute(PromptCandidate.__table__.update()
+                             .where(PromptCandidate.id == candidate.id)
+                             .values(fingerprint=fp))
+        sess.commit()
+    sess.close()
+
+
 def get_session(engine):
     session = Session(engine)
     return session
@@ -62,6 +116,57 @@ def get_candidate_by_id(sess, id):
     return sess.query(PromptCandidate).filter_by(id=id).one()
 
 
+def get_candidate_by_fingerprint(sess, fingerprint):
+    return (sess.query(PromptCandidate)
+            .filter_by(fingerprint=fingerprint)
+            .first())
+
+
+def get_similar_candidate(sess, candidate, threshold):
+    """
+    Return the stored candidate most similar to the given one if its
+    similarity ratio of canonical text is at least `threshold`
+    """
+    import difflib
+
+    text = candidate.canonical_text()
+    best, best_ratio = None, threshold
+
+    for rec in (sess.query(PromptCandidate)
+                .filter(PromptCandidate.fingerprint.isnot(None))):
+        matcher = difflib.SequenceMatcher(a=text, b=rec.canonical_text())
+        if matcher.quick_ratio() < best_ratio:
+            continue
+
+        ratio = matcher.ratio()
+        if ratio >= best_ratio:
+            best, best_ratio = rec, ratio
+
+    return best
+
+
+def add_candidate(sess, candidate, threshold=None):
+    """
+    Add candidate unless an identical one, or a similar one when
+    `threshold` is given, exists. Returns the stored candidate.
+    """
+    existing = get_candidate_by_fingerprint(sess,
+                                            candidate.compute_fingerprint())
+    if existing is None and threshold is not None:
+        existing = get_similar_candidate(sess, candidate, threshold)
+
+    if existing is not None:
+        if candidate in sess:
+            sess.expunge(candidate)
+        logger.info(f"Candidate is a duplicate of "
+                    f"PromptCandidate(id={existing.id})")
+        return existing
+
+    sess.add(candidate)
+    sess.commit()
+    return candidate
+
+
 def get_results(sess):
     return sess.query(EvalResult).all()
 
@@ -70,10 +175,45 @@ def get_result_by_id(sess, id):
     return sess.query(EvalResult).filter_by(id=id).one()
 
 
+def get_results_by_fingerprint(sess, candidate_fp, evaluator_name=None):
+    query = sess.query(EvalResult).filter_by(candidate_fp=candidate_fp)
+
+    if evaluator_name:
+        query = query.filter_by(evaluator_name=evaluator_name)
+
+    return query.order_by(EvalResult.id.desc()).all()
+
+
 def get_eval_sets(sess):
     return sess.query(EvalSet).all()
 
 
+def get_eval_set_for_dataset(sess, candidate, dataset):
+    """
+    Return the latest EvalSet of the candidate (or of any candidate with
+    the same fingerprint) whose results cover exactly the given dataset
+    """
+    keys = set((x.id, x.content_hash) for x in dataset)
+
+    eval_sets = (sess.query(EvalSet)
+                 .join(PromptCandidate, EvalSet.candidate_id
+                       == PromptCandidate.id)
+                 .filter(PromptCandidate.fingerprint
+                         == candidate.compute_fingerprint())
+                 .order_by(EvalSet.id.desc()))
+
+    for eval_set in eval_sets:
+        if set((x.data_id, x.data_hash) for x in eval_set.results) == keys:
+            return eval_set
+    return None
+
+
+def is_analyzed(sess, eval_set):
+    return (sess.query(Analysis)
+            .filter(Analysis.eval_sets.any(EvalSet.id == eval_set.id))
+            .first()) is not None
+
+
 def get_analysis(sess):
     return sess.query(Analysis).all()
 
@@ -1,6 +1,8 @@
 import textwrap
 from abc import abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 from langchain.chains.llm import LLMChain
 from langchain.chat_models import ChatOpenAI
@@ -8,7 +10,9 @@ from langchain.llms.base import BaseLLM
 from langchain.prompts import PromptTemplate
 from ppromptor.base.command import CommandExecutor
 from ppromptor.base.schemas import EvalResult, EvalSet, IOPair, PromptCandidate
-from ppromptor.config import PP_VERBOSE
+from ppromptor.config import DEFAULT_MAX_CONCURRENCY, PP_VERBOSE
+from ppromptor.db import get_results_by_fingerprint
+from ppromptor.llms.cache import BaseLLMCache
 from ppromptor.loggers import logger
 from ppromptor.scorefuncs import BaseScoreFunc
 from ppromptor.utils import bulletpointize, get_llm_params
@@ -17,15 +21,23 @@ from ppromptor.utils import bulletpointize, get_llm_params
 class BaseEvaluator(CommandExecutor):
     def __init__(self,
                  llm: BaseLLM,
-                 score_funcs: Optional[List[BaseScoreFunc]] = None) -> None:
+                 score_funcs: Optional[List[BaseScoreFunc]] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 cache: Optional[BaseLLMCache] = None,
+                 session=None) -> None:
         if score_funcs is None:
             self.score_funcs = []
         else:
             self.score_funcs = score_funcs
 
+        assert max_concurrency >= 1
+
         self._prompt_str: str
         self._validate_prompt()
         self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self._sess = session
         self._prompt = None
 
     @property
@@ -63,7 +75,10 @@ class BaseEvaluator(CommandExecutor):
 class Evaluator(BaseEvaluator):
     def __init__(self,
                  llm: BaseLLM,
-                 score_funcs: Optional[List[BaseScoreFunc]] = None) -> None:
+                 score_funcs: Optional[List[BaseScoreFunc]] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 cache: Optional[BaseLLMCache] = None,
+                 session=None) -> None:
 
         self._prompt_str = ("You are a {role}."
                             " Base on below INPUT, {goal}\n") + """
@@ -79,7 +94,8 @@ class Evaluator(BaseEvaluator):
         Please strictly follow above guidelines and constraints.
         Answer:
         """
-        super().__init__(llm, score_funcs)
+        super().__init__(llm, score_funcs, max_concurrency, cache,
+                         session)
 
     def _get_scores(self, results) -> dict:
         res = {}
@@ -100,6 +116,60 @@ class Evaluator(BaseEvaluator):
                 score += value
         return score
 
+    def _predict(self, chain, candidate, record) -> str:
+        data = {
+            "role": candidate.role,
+            "goal": candidate.goal,
+            "input": record.input,
+            "guidelines": bulletpointize(candidate.guidelines),
+            "constraints": bulletpointize(candidate.constraints)
+        }
+
+        return self._run_chain(chain, data).strip()
+
+    def _predict_all(self, chain, candidate, dataset) -> List[str]:
+        predict = partial(self._predict, chain, candidate)
+
+        if self.max_concurrency <= 1 or len(dataset) <= 1:
+            return [predict(record) for record in dataset]
+
+        # LLM calls are network/IO bound, so threads are enough here.
+        # executor.map() yields in submission order, which keeps the
+        # predictions aligned with the dataset.
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(predict, dataset))
+
+    def _load_results(self, candidate_fp,
+                      dataset) -> Dict[Tuple, EvalResult]:
+        """
+        Return stored results of the candidate fingerprint that are valid for
+        the given dataset, keyed by (IOPair.id, IOPair.content_hash)
+        """
+        if self._sess is None:
+            return {}
+
+        llm_params = get_llm_params(self.llm)
+        keys = set((x.id, x.content_hash) for x in dataset)
+
+        stored: Dict[Tuple, EvalResult] = {}
+        for res in get_results_by_fingerprint(self._sess,
+                                              candidate_fp,
+                                              self.__class__.__name__):
+            key = (res.data_id, res.data_hash)
+            if key in keys and key not in stored \
+               and res.llm_params == llm_params:
+                stored[key] = res
+        return stored
+
+    def _score(self, candidate, record, pred, scores=None) -> dict:
+        rec_scores = dict(scores) if scores else {}
+        for sf in self.score_funcs:
+            if sf.name not in rec_scores:
+                rec_scores[sf.name] = sf.score(candidate,
+                                               record,
+                                               pred)
+        return rec_scores
+
     def evaluate(self,
                  dataset: List[IOPair],
                  candidate: PromptCandidate,
@@ -107,24 +177,34 @@ class Evaluator(BaseEvaluator):
 
         chain = LLMChain(llm=self.llm, prompt=self.prompt, verbose=PP_VERBOSE)
 
+        candidate_fp = candidate.compute_fingerprint()
+        stored = self._load_results(candidate_fp, dataset)
+        missing = [x for x in dataset
+                   if (x.id, x.content_hash) not in stored]
+
+        if stored:
+            logger.info(f"Reuse {len(dataset) - len(missing)} stored results,"
+                        f" evaluate {len(missing)} records")
+
+        preds = dict(zip([id(x) for x in missing],
+                         self._predict_all(chain, candidate, missing)))
+
         results = []
 
         for record in dataset:
-            data = {
-                "role": candidate.role,
-                "goal": candidate.goal,
-                "input": record.input,
-                "guidelines": bulletpointize(candidate.guidelines),
-                "constraints": bulletpointize(candidate.constraints)
-            }
-
-            pred = chain(data)["text"].strip()
-
-            rec_scores = {}
-            for sf in self.score_funcs:
-                rec_scores[sf.name] = sf.score(candidate,
-                                               record,
-                                               pred)
+            key = (record.id, record.content_hash)
+
+            if key in stored:
+                res = stored[key]
+                rec_scores = self._score(candidate, record,
+                                         res.prediction, res.scores)
+                if rec_scores != res.scores:
+                    res.scores = rec_scores
+                results.append(res)
+                continue
+
+            pred = preds[id(record)]
+            rec_scores = self._score(candidate, record, pred)
 
             logger.debug(f"Evaluator Prediction: {pred}")
             logger.debug(f"Evaluator Answer: {record.output}")
@@ -135,10 +215,13 @@ class Evaluator(BaseEvaluator):
                              record,
                              pred,
                              rec_scores,
-                             llm_params=get_llm_params(self.llm))
+                             llm_params=get_llm_params(self.llm),
+                             candidate_fp=candidate_fp,
+                             data_hash=record.content_hash)
             results.append(res)
 
-        scores = [x.scores for x in results]
+        # copies, since stored results are shared with earlier EvalSets
+        scores = [dict(x.scores) for x in results]
         res_set = EvalSet(candidate=candidate,
                           results=results,
                           scores=self._get_scores(scores),
@@ -0,0 +1,137 @@
+import time
+from abc import abstractmethod
+from threading import RLock
+from typing import Dict, Optional
+
+from ppromptor.base.schemas import LLMCacheEntry
+from ppromptor.config import LLM_CACHE_MAX_AGE, LLM_CACHE_MAX_SIZE
+from ppromptor.loggers import logger
+from ppromptor.utils import hash_content
+
+
+def llm_cache_key(prompt: str, llm_params: Dict) -> str:
+    return hash_content(prompt, llm_params)
+
+
+class BaseLLMCache:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def lookup(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def update(self, key: str, prompt: str, llm_params: Dict,
+               response: str) -> None:
+        pass
+
+    @abstractmethod
+    def evict(self) -> int:
+        pass
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class ORMLLMCache(BaseLLMCache):
+    """
+    LLM response cache stored in the `llm_cache` table of the project DB
+
+    Entries older than `max_age` seconds are treated as missing, and the
+    table is trimmed to the `max_size` most recently used entries every
+    `evict_interval` updates.
+    """
+    def __init__(self, session,
+                 max_size: Optional[int] = LLM_CACHE_MAX_SIZE,
+                 max_age: Optional[float] = LLM_CACHE_MAX_AGE,
+                 evict_interval: int = 100):
+        super().__init__()
+        self._sess = session
+        self.max_size = max_size
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+        self._n_updates = 0
+
+        # The session may be shared with concurrent evaluation threads
+        self._lock = RLock()
+
+    def _is_expired(self, entry: LLMCacheEntry, now: float) -> bool:
+        return (self.max_age is not None
+                and entry.created_at < now - self.max_age)
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = (self._sess.query(LLMCacheEntry)
+                     .filter_by(key=key)
+                     .first())
+            now = time.time()
+
+            if entry is None or self._is_expired(entry, now):
+                self.misses += 1
+                return None
+
+            entry.hits += 1
+            entry.accessed_at = now
+            self._sess.add(entry)
+            self._sess.commit()
+
+            self.hits += 1
+            return entry.response
+
+    def update(self, key: str, prompt: str, llm_params: Dict,
+               response: str) -> None:
+        with self._lock:
+            now = time.time()
+            entry = (self._sess.query(LLMCacheEntry)
+                     .filter_by(key=key)
+                     .first())
+            if entry is None:
+                entry = LLMCacheEntry(key=key,
+                                      prompt=prompt,
+                                      llm_params=llm_params,
+                                      response=response)
+            entry.response = response
+            entry.created_at = now
+            entry.accessed_at = now
+
+            self._sess.add(entry)
+            self._sess.commit()
+
+            self._n_updates += 1
+            if self._n_updates % self.evict_interval == 0:
+                self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and trim the table to max_size
+
+        Returns number of removed entries
+        """
+        with self._lock:
+            removed = 0
+
+            if self.max_age is not None:
+                removed += (self._sess.query(LLMCacheEntry)
+                            .filter(LLMCacheEntry.created_at
+                                    < time.time() - self.max_age)
+                            .delete(synchronize_session=False))
+
+            if self.max_size is not None:
+                stale_ids = (self._sess.query(LLMCacheEntry.id)
+                             .order_by(LLMCacheEntry.accessed_at.desc())
+                             .offset(self.max_size)
+                             .subquery())
+                removed += (self._sess.query(LLMCacheEntry)
+                            .filter(LLMCacheEntry.id.in_(
+                                stale_ids.select()))
+                            .delete(synchronize_session=False))
+
+            self._sess.commit()
+
+            if removed:
+                logger.debug(f"LLM cache evicted {removed} entries")
+
+            return removed
@@ -1,18 +1,21 @@
 import re
 import textwrap
 from abc import abstractmethod
+from typing import Optional
 
 from langchain.chains.llm import LLMChain
 from langchain.prompts import PromptTemplate
 from ppromptor.base.command import CommandExecutor
 from ppromptor.base.schemas import PromptCandidate
 from ppromptor.config import PP_VERBOSE
+from ppromptor.llms.cache import BaseLLMCache
 from ppromptor.utils import gen_prompt
 
 
 class BaseProposer(CommandExecutor):
-    def __init__(self, llm) -> None:
+    def __init__(self, llm, cache: Optional[BaseLLMCache] = None) -> None:
         self.llm = llm
+        self.cache = cache
         self.prompt: PromptTemplate
 
     @abstractmethod
@@ -24,7 +27,7 @@ class BaseProposer(CommandExecutor):
 
 
 class Proposer(BaseProposer):
-    def __init__(self, llm) -> None:
+    def __init__(self, llm, cache: Optional[BaseLLMCache] = None) -> None:
         goal = """Your job is to design an LLM AI robot to generate 
         the below ouputs, according to the given inputs. The LLM AI robot
         is equipped with a pretrained LLM to generate outputs. You need to
@@ -64,7 +67,7 @@ class Proposer(BaseProposer):
         that can generate above pairs.
         """
 
-        super().__init__(llm)
+        super().__init__(llm, cache)
 
         self.prompt = gen_prompt(goal=goal,
                                  instrutions=instrutions,
@@ -75,9 +78,7 @@ class Proposer(BaseProposer):
         if analysis is None:
             chain = LLMChain(llm=self.llm, prompt=self.prompt, verbose=PP_VERBOSE)
 
-            res = chain({"examples": "\n".join([f"{v+1}. {str(x)}" for v, x in enumerate(dataset)])})
-
-            prompt_proposal = res["text"]  # .replace("INSTRUCTION:", "").strip()
+            prompt_proposal = self._run_chain(chain, {"examples": "\n".join([f"{v+1}. {str(x)}" for v, x in enumerate(dataset)])})
 
             return self._parse(prompt_proposal)
         else:
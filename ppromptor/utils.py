@@ -1,3 +1,5 @@
+import hashlib
+import json
 import textwrap
 from typing import Dict, Optional, Union
 
@@ -12,6 +14,15 @@ def get_llm_params(llm) -> Dict:
     return res
 
 
+def hash_content(*parts) -> str:
+    """
+    Return a stable sha256 hex digest of JSON-serializable parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str,
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def bulletpointize(lst):
     res = []
     for idx, v in enumerate(lst):
@@ -36,6 +36,12 @@ if __name__ == '__main__':
             default=None,
             help='Path or name of databse')
 
+        parser.add_argument(
+            '--max_concurrency',
+            type=int,
+            default=1,
+            help='Maximum number of concurrent LLM calls per evaluation')
+
         return parser.parse_args()
 
     args = parse_args()
@@ -64,5 +70,6 @@ if __name__ == '__main__':
 
     agent = JobQueueAgent(load_lm(args.eval_llm),
                           load_lm(args.analysis_llm),
-                          db=sess)
+                          db=sess,
+                          max_concurrency=args.max_concurrency)
     agent.run(dataset)
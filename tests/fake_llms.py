@@ -1,5 +1,7 @@
 """Fake LLM wrapper for testing purposes."""
-from typing import Any, List, Mapping, Optional
+import random
+import time
+from typing import Any, Dict, List, Mapping, Optional
 
 from langchain.callbacks.manager import CallbackManagerForLLMRun
 from langchain.llms.base import LLM
@@ -37,3 +39,46 @@ class FakeListLLM(LLM):
     @property
     def _default_params(self):
         return {}
+
+
+class FakeDictLLM(LLM):
+    """Fake LLM that answers by looking up a key contained in the prompt.
+
+    Unlike FakeListLLM, responses do not depend on call order, so it can be
+    used to test concurrent callers. An optional random delay shuffles the
+    completion order of concurrent calls.
+    """
+
+    responses: Dict[str, str]
+    default: str = ""
+    max_delay: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        """Return type of llm."""
+        return "fake-dict"
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+    ) -> str:
+        self.calls += 1
+
+        if self.max_delay:
+            time.sleep(random.uniform(0, self.max_delay))
+
+        for key, response in self.responses.items():
+            if key in prompt:
+                return response
+        return self.default
+
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        return {}
+
+    @property
+    def _default_params(self):
+        return {}
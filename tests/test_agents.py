@@ -1,4 +1,4 @@
-from fake_llms import FakeListLLM
+from fake_llms import FakeDictLLM, FakeListLLM
 from ppromptor.analyzers import Analyzer
 from ppromptor.base.schemas import (Analysis, EvalResult, EvalSet, IOPair,
                                     PromptCandidate, Recommendation)
@@ -48,6 +48,25 @@ def test_evaluator():
 
     return res
 
+
+def test_evaluator_concurrent():
+    candidate = PromptCandidate(role='test', goal='test',
+                                guidelines=['test'], constraints=['test'])
+    data = [IOPair(input=f"in-{i}", output=f"out-{i}") for i in range(20)]
+    llm = FakeDictLLM(responses={f"'in-{i}'": f"out-{i}" for i in range(20)},
+                      max_delay=0.01)
+    evaluator = Evaluator(llm, [SequenceMatcherScore(None)],
+                          max_concurrency=8)
+    res = evaluator.evaluate(data, candidate)
+
+    assert isinstance(res, EvalSet)
+    assert [x.data for x in res.results] == data
+    assert [x.prediction for x in res.results] == [x.output for x in data]
+
+    seq_res = Evaluator(llm, [SequenceMatcherScore(None)]).evaluate(data,
+                                                                    candidate)
+    assert res.final_score == seq_res.final_score
+
 def test_analyzer():
     report = """
     THOUGHTS:
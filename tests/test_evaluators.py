@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+
+from fake_llms import FakeDictLLM
+from ppromptor.base.schemas import IOPair, PromptCandidate
+from ppromptor.db import (add_iopair, create_engine, get_dataset, get_session,
+                          update_iopair)
+from ppromptor.evaluators import Evaluator
+from ppromptor.scorefuncs import SequenceMatcherScore
+
+
+def _candidate():
+    return PromptCandidate(role='test', goal='test',
+                           guidelines=['test'], constraints=['test'],
+                           examples=[])
+
+
+def test_incremental_evaluation():
+    with tempfile.TemporaryDirectory() as tmp:
+        sess = get_session(create_engine(os.path.join(tmp, 'test.db')))
+
+        for i in range(5):
+            add_iopair(sess, f"in-{i}", f"out-{i}")
+
+        llm = FakeDictLLM(responses={f"'in-{i}'": f"out-{i}"
+                                     for i in range(10)})
+        evaluator = Evaluator(llm, [SequenceMatcherScore(None)],
+                              session=sess)
+
+        candidate = _candidate()
+        sess.add(candidate)
+        eval_set = evaluator.evaluate(get_dataset(sess), candidate)
+        sess.add(eval_set)
+        sess.commit()
+        assert llm.calls == 5
+
+        add_iopair(sess, "in-5", "out-5")
+        add_iopair(sess, "in-6", "out-6")
+        update_iopair(sess, 1, "in-9", "out-9")
+
+        # An identical candidate reuses results of the first one
+        candidate = _candidate()
+        sess.add(candidate)
+        dataset = get_dataset(sess)
+        eval_set = evaluator.evaluate(dataset, candidate)
+        sess.add(eval_set)
+        sess.commit()
+
+        assert llm.calls == 8
+        assert [x.data for x in eval_set.results] == dataset
+        assert [x.prediction for x in eval_set.results] \
+            == [x.output for x in dataset]
+
+
+def test_upgrade_existing_db():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'antonyms.db')
+        shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'examples',
+                                 'antonyms', 'antonyms.db'), db_path)
+
+        sess = get_session(create_engine(db_path))
+        llm = FakeDictLLM(responses={})
+        evaluator = Evaluator(llm, [SequenceMatcherScore(None)],
+                              session=sess)
+
+        dataset = get_dataset(sess)
+        eval_set = evaluator.evaluate(dataset, _candidate())
+        sess.add(eval_set)
+        sess.commit()
+
+        assert llm.calls == len(dataset)
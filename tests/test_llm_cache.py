@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+from fake_llms import FakeDictLLM
+from ppromptor.base.schemas import IOPair, LLMCacheEntry, PromptCandidate
+from ppromptor.db import create_engine, get_session
+from ppromptor.evaluators import Evaluator
+from ppromptor.llms.cache import ORMLLMCache
+from ppromptor.scorefuncs import SequenceMatcherScore
+
+dataset = [IOPair(input=f"in-{i}", output=f"out-{i}") for i in range(5)]
+
+
+def test_cache_lookup_update():
+    with tempfile.TemporaryDirectory() as tmp:
+        sess = get_session(create_engine(os.path.join(tmp, 'test.db')))
+        cache = ORMLLMCache(sess)
+
+        assert cache.lookup("k1") is None
+        cache.update("k1", "prompt", {"llm_name": "fake"}, "response")
+        assert cache.lookup("k1") == "response"
+        assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_cache_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        sess = get_session(create_engine(os.path.join(tmp, 'test.db')))
+        cache = ORMLLMCache(sess, max_size=3, max_age=None)
+
+        for i in range(5):
+            cache.update(f"k{i}", "prompt", {}, f"r{i}")
+
+        assert cache.evict() == 2
+        assert sess.query(LLMCacheEntry).count() == 3
+        assert cache.lookup("k0") is None
+        assert cache.lookup("k4") == "r4"
+
+        cache.max_age = -1
+        assert cache.lookup("k4") is None
+        assert cache.evict() == 3
+
+
+def test_evaluator_with_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        sess = get_session(create_engine(os.path.join(tmp, 'test.db')))
+        cache = ORMLLMCache(sess)
+
+        candidate = PromptCandidate(role='test', goal='test',
+                                    guidelines=['test'],
+                                    constraints=['test'])
+        llm = FakeDictLLM(responses={f"'in-{i}'": f"out-{i}"
+                                     for i in range(5)})
+        evaluator = Evaluator(llm, [SequenceMatcherScore(None)],
+                              max_concurrency=4, cache=cache)
+
+        res1 = evaluator.evaluate(dataset, candidate)
+        assert llm.calls == 5
+
+        res2 = evaluator.evaluate(dataset, candidate)
+        assert llm.calls == 5
+        assert cache.hits == 5
+        assert ([x.prediction for x in res1.results]
+                == [x.prediction for x in res2.results])
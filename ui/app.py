@@ -16,12 +16,13 @@ from config import DEFAULT_CONFIG
 from ppromptor.agent import JobQueueAgent
 from ppromptor.base.schemas import IOPair, PromptCandidate
 from ppromptor.config import DEFAULT_PRIORITY
-from ppromptor.db import (add_iopair, create_engine, get_analysis,
-                          get_analysis_by_candidate_id, get_analysis_by_id,
-                          get_candidate_by_id, get_candidates,
-                          get_candidates_with_score, get_commands_as_dict,
-                          get_dataset, get_result_by_id, get_results,
-                          get_session, update_iopair)
+from ppromptor.db import (add_candidate, add_iopair, create_engine,
+                          get_analysis, get_analysis_by_candidate_id,
+                          get_analysis_by_id, get_candidate_by_id,
+                          get_candidates, get_candidates_with_score,
+                          get_commands_as_dict, get_dataset,
+                          get_result_by_id, get_results, get_session,
+                          update_iopair)
 from ppromptor.loggers import logger
 from ppromptor.utils import load_lm
 from streamlit_autorefresh import st_autorefresh
@@ -189,10 +190,8 @@ else:
 
                 cdd_add_btn = st.button('Create Candidate')
                 if cdd_add_btn:
-                    candidate = PromptCandidate(**cdd_data)
-
-                    sess.add(candidate)
-                    sess.commit()
+                    candidate = add_candidate(sess,
+                                              PromptCandidate(**cdd_data))
 
                     __data = {
                         "candidate": candidate,